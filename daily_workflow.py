@@ -1,15 +1,27 @@
 import os
 import sys
-import json
+import atexit
+import base64
+import functools
+import hashlib
 import logging
+import queue
+import re
 import requests
 import tempfile
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from groq import Groq
 import dspy
-from fetch_github_commits import fetch_commits_from_last_24_hours, format_commits_for_analysis
+import json_utils
+from fetch_github_commits import CACHE_DIR, fetch_commits_from_last_24_hours, format_commits_for_analysis
 from linkedin_post import _get_author_urn
 
 load_dotenv()
@@ -23,31 +35,35 @@ log_file = LOG_DIR / f"workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 # Create handlers
 file_handler = logging.FileHandler(log_file, encoding='utf-8')
 
-# Create a safe console handler that handles Windows encoding issues
+# Text equivalents for emojis the Windows console can't encode
+_EMOJI_MAP = {
+    '🚀': '[START]',
+    '📥': '[FETCH]',
+    '📝': '[FORMAT]',
+    '🤖': '[AI]',
+    '🎨': '[IMAGE]',
+    '📤': '[POST]',
+    '✅': '[SUCCESS]',
+    '❌': '[ERROR]',
+    '⚠️': '[WARNING]',
+    'ℹ️': '[INFO]',
+    '✓': '[OK]',
+    '📊': '[METRICS]',
+}
+_EMOJI_RE = re.compile("|".join(map(re.escape, _EMOJI_MAP)))
+
+
+def _emoji_text(match):
+    return _EMOJI_MAP[match.group(0)]
+
+
+# Create a safe console handler that handles encoding issues
 class SafeConsoleHandler(logging.StreamHandler):
-    """Console handler that safely handles emoji/Unicode on Windows."""
+    """Console handler that falls back to ASCII when the stream can't encode a record."""
     def emit(self, record):
         try:
-            msg = self.format(record)
+            msg = self.render(record)
             stream = self.stream
-            # Replace emojis with text equivalents for Windows console
-            if sys.platform == 'win32':
-                emoji_map = {
-                    '🚀': '[START]',
-                    '📥': '[FETCH]',
-                    '📝': '[FORMAT]',
-                    '🤖': '[AI]',
-                    '🎨': '[IMAGE]',
-                    '📤': '[POST]',
-                    '✅': '[SUCCESS]',
-                    '❌': '[ERROR]',
-                    '⚠️': '[WARNING]',
-                    'ℹ️': '[INFO]',
-                    '✓': '[OK]',
-                    '📊': '[METRICS]',
-                }
-                for emoji, replacement in emoji_map.items():
-                    msg = msg.replace(emoji, replacement)
             stream.write(msg + self.terminator)
             self.flush()
         except UnicodeEncodeError:
@@ -58,12 +74,36 @@ class SafeConsoleHandler(logging.StreamHandler):
             except:
                 pass
 
-console_handler = SafeConsoleHandler(sys.stdout)
+    def render(self, record):
+        return self.format(record)
+
+
+class WindowsConsoleHandler(SafeConsoleHandler):
+    """Console handler that also replaces emojis with text equivalents on Windows."""
+    def render(self, record):
+        return _EMOJI_RE.sub(_emoji_text, self.format(record))
+
+
+# Pick the handler once at import time instead of checking the platform per record
+console_handler = (WindowsConsoleHandler if sys.platform == 'win32' else SafeConsoleHandler)(sys.stdout)
+
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+file_handler.setFormatter(log_formatter)
+console_handler.setFormatter(log_formatter)
+
+# File/console I/O happens on the listener thread. QueueHandler.prepare() still
+# interpolates the message and renders any traceback on the calling thread, so
+# it only gets the bare message; the listener's handlers add the prefix once.
+log_queue = queue.Queue(-1)
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[file_handler, console_handler]
+    handlers=[queue_handler]
 )
 
 logger = logging.getLogger(__name__)
@@ -74,6 +114,34 @@ ACCESS_TOKEN = os.environ.get("access_token", "")
 PERSON_URN = os.environ.get("PERSON_URN", "").strip()
 BASE_URL = "https://api.linkedin.com/v2"
 
+# (connect, read) timeouts in seconds; Imagen renders and image uploads get a longer read window
+HTTP_TIMEOUT = (5, 30)
+LONG_HTTP_TIMEOUT = (5, 60)
+
+def _make_session(retry):
+    """HTTP session that reuses TLS connections and applies `retry` to every https request."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry))
+    session.headers.update({"X-Restli-Protocol-Version": "2.0.0"})
+    return session
+
+
+# Every call here is a POST, which urllib3 never retries on status or read
+# errors by default. _RETRY_SESSION opts POST in for the calls that are safe
+# to repeat (Imagen renders, LinkedIn upload registration); _SESSION only
+# retries failed connects, so a flaky 5xx can never publish the same post or
+# upload twice.
+_RETRY_SESSION = _make_session(
+    Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+        raise_on_status=False,
+    )
+)
+_SESSION = _make_session(Retry(total=3, backoff_factor=0.5))
+
 # Debug: Log environment variable status (without exposing values)
 IS_GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
 if IS_GITHUB_ACTIONS:
@@ -82,9 +150,38 @@ if IS_GITHUB_ACTIONS:
     logger.info(f"GitHub secrets configured: GIT_TOKEN={'Yes' if os.environ.get('GIT_TOKEN') else 'No'}, Groq_Api_Key={'Yes' if GROQ_API_KEY else 'No'}")
 
 # DSPy configuration
-DSPY_EXAMPLES_FILE = Path("dspy_examples.json")
+DSPY_EXAMPLES_FILE = Path("dspy_examples.jsonl")
+DSPY_MAX_EXAMPLES = 50
 DSPY_METRICS_FILE = Path("dspy_metrics.json")
 
+# Prompt for Imagen; {post_excerpt} is the first 300 characters of the post
+IMAGE_PROMPT_TEMPLATE = """Professional, modern LinkedIn post image about software development and coding.
+
+Visual style: Clean, modern, tech-focused design with professional color scheme. 
+Theme: Coding, GitHub commits, software development, programming.
+Mood: Professional, engaging, inspiring for developers.
+Design elements: Code snippets, GitHub logo, developer tools, clean typography.
+Color palette: Professional blues, greens, or modern gradients.
+Avoid: Cluttered designs, unprofessional imagery.
+
+The post content is about: {post_excerpt}"""
+
+# Imagen cache: generated images keyed by prompt hash, so retries don't pay for a new image.
+# Lives under the GitHub cache dir, which the CI workflow persists between runs.
+IMAGEN_CACHE_DIR = CACHE_DIR / "imagen"
+IMAGEN_CACHE_SIZE = 20
+
+# Set after an Imagen billing error; holds the expiry timestamp so daily runs skip the doomed call.
+# Kept in the persisted cache dir so the next scheduled run on a fresh runner still sees it.
+IMAGEN_DISABLED_FLAG = CACHE_DIR / "imagen_disabled"
+IMAGEN_DISABLED_TTL = 24 * 60 * 60
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_author_urn():
+    """Resolve the LinkedIn author URN once per process."""
+    return _get_author_urn()
+
 
 class LinkedInPostGenerator(dspy.Signature):
     """Generate an engaging LinkedIn post from GitHub commit activity."""
@@ -93,22 +190,31 @@ class LinkedInPostGenerator(dspy.Signature):
     post = dspy.OutputField(desc="Engaging LinkedIn post (200-300 words, professional yet friendly tone, with emojis used sparingly, includes call-to-action)")
 
 
-def setup_dspy():
-    """Initialize DSPy with Groq backend."""
-    logger.info("Setting up DSPy with Groq backend...")
-    
+@functools.cache
+def _get_lm():
+    """Build the Groq-backed DSPy LM once per process."""
     if not GROQ_API_KEY:
         raise ValueError("Groq_Api_Key not set in .env")
     
+    # Configure DSPy to use Groq via LiteLLM
+    # Use groq/ prefix for LiteLLM to recognize Groq provider
+    return dspy.LM(
+        model="groq/llama-3.3-70b-versatile",
+        api_key=GROQ_API_KEY
+    )
+
+
+def setup_dspy(lm_future=None):
+    """Initialize DSPy with Groq backend.
+    
+    `lm_future` is an optional Future for an LM already being built in the background.
+    """
+    logger.info("Setting up DSPy with Groq backend...")
+    
     try:
-        # Configure DSPy to use Groq via LiteLLM
-        # Use groq/ prefix for LiteLLM to recognize Groq provider
-        lm = dspy.LM(
-            model="groq/llama-3.3-70b-versatile",
-            api_key=GROQ_API_KEY
-        )
-        
-        dspy.configure(lm=lm)
+        lm = lm_future.result() if lm_future is not None else _get_lm()
+        if dspy.settings.lm is not lm:
+            dspy.configure(lm=lm)
         logger.info("[OK] DSPy configured with Groq backend (llama-3.3-70b-versatile)")
         return lm
     except Exception as e:
@@ -117,11 +223,11 @@ def setup_dspy():
 
 
 def load_dspy_examples():
-    """Load past examples for DSPy learning."""
+    """Load past examples for DSPy learning (the most recent DSPY_MAX_EXAMPLES)."""
     if DSPY_EXAMPLES_FILE.exists():
         try:
-            with open(DSPY_EXAMPLES_FILE, 'r') as f:
-                examples = json.load(f)
+            with open(DSPY_EXAMPLES_FILE, 'rb') as f:
+                examples = [json_utils.loads(line) for line in deque(f, maxlen=DSPY_MAX_EXAMPLES) if line.strip()]
             logger.info(f"Loaded {len(examples)} DSPy examples from {DSPY_EXAMPLES_FILE}")
             return examples
         except Exception as e:
@@ -130,8 +236,24 @@ def load_dspy_examples():
     return []
 
 
+def trim_dspy_examples():
+    """Rewrite the examples file down to the last DSPY_MAX_EXAMPLES once it doubles in size."""
+    if not DSPY_EXAMPLES_FILE.exists():
+        return
+    try:
+        with open(DSPY_EXAMPLES_FILE, 'rb') as f:
+            lines = deque(f, maxlen=2 * DSPY_MAX_EXAMPLES + 1)
+        if len(lines) <= 2 * DSPY_MAX_EXAMPLES:
+            return
+        with open(DSPY_EXAMPLES_FILE, 'wb') as f:
+            f.writelines(list(lines)[-DSPY_MAX_EXAMPLES:])
+        logger.info(f"Trimmed DSPy examples to last {DSPY_MAX_EXAMPLES}")
+    except Exception as e:
+        logger.warning(f"Error trimming DSPy examples: {e}")
+
+
 def save_dspy_example(commits_summary, generated_post, metrics=None):
-    """Save a new example for DSPy learning."""
+    """Append a new example for DSPy learning."""
     example = {
         "timestamp": datetime.now().isoformat(),
         "commits_summary": commits_summary[:1000],  # Truncate for storage
@@ -139,37 +261,29 @@ def save_dspy_example(commits_summary, generated_post, metrics=None):
         "metrics": metrics or {}
     }
     
-    examples = load_dspy_examples()
-    examples.append(example)
-    
-    # Keep only last 50 examples to avoid file bloat
-    if len(examples) > 50:
-        examples = examples[-50:]
-    
     try:
-        with open(DSPY_EXAMPLES_FILE, 'w') as f:
-            json.dump(examples, f, indent=2)
-        logger.info(f"Saved new DSPy example (total: {len(examples)})")
+        with open(DSPY_EXAMPLES_FILE, 'ab') as f:
+            f.write(json_utils.dumps(example) + b"\n")
+        logger.info(f"Saved new DSPy example to {DSPY_EXAMPLES_FILE}")
     except Exception as e:
         logger.error(f"Error saving DSPy example: {e}")
+        return
+    
+    # Keep the file bounded; only rewrites once it has grown past 2x the cap
+    trim_dspy_examples()
 
 
-def analyze_commits_with_dspy(commits_summary):
+def analyze_commits_with_dspy(commits_summary, lm_future=None):
     """Use DSPy to analyze commits and create a beautiful LinkedIn post."""
     logger.info("Starting DSPy analysis of commits...")
     
     try:
         # Setup DSPy
-        setup_dspy()
+        setup_dspy(lm_future)
         
         # Create DSPy module
         generate_post = dspy.ChainOfThought(LinkedInPostGenerator)
         
-        # Load past examples for context (optional, for future optimization)
-        examples = load_dspy_examples()
-        if examples:
-            logger.info(f"Using {len(examples)} past examples for context")
-        
         # Generate post
         logger.info("Generating LinkedIn post with DSPy...")
         result = generate_post(commits_summary=commits_summary)
@@ -196,24 +310,58 @@ def analyze_commits_with_dspy(commits_summary):
         raise
 
 
+def build_image_prompt(post_text):
+    """Create the Imagen prompt for a post."""
+    return IMAGE_PROMPT_TEMPLATE.format(post_excerpt=post_text[:300])
+
+
+def _imagen_cache_path(image_prompt):
+    """Path of the cached image for an Imagen prompt."""
+    return IMAGEN_CACHE_DIR / f"{hashlib.sha256(image_prompt.encode('utf-8')).hexdigest()}.png"
+
+
+def _store_imagen_cache(cache_path, img_bytes):
+    """Write an image to the Imagen cache and keep only the newest IMAGEN_CACHE_SIZE entries."""
+    try:
+        IMAGEN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(img_bytes)
+        with os.scandir(IMAGEN_CACHE_DIR) as it:
+            entries = sorted((e for e in it if e.is_file()), key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in entries[IMAGEN_CACHE_SIZE:]:
+            os.remove(entry.path)
+    except OSError as e:
+        logger.warning(f"Could not update Imagen cache: {e}")
+
+
+def _imagen_disabled():
+    """Return True while a cached Imagen billing-error flag is still fresh."""
+    try:
+        return float(IMAGEN_DISABLED_FLAG.read_text()) > time.time()
+    except (OSError, ValueError):
+        return False
+
+
 def generate_image_with_gemini(post_text):
-    """Use Gemini Imagen API to generate an image based on the LinkedIn post."""
+    """Use Gemini Imagen API to generate an image based on the LinkedIn post.
+    
+    Returns an (image_bytes, mime_type) tuple, or None if no image was generated.
+    """
     logger.info("Starting Gemini Imagen image generation...")
     
+    image_prompt = build_image_prompt(post_text)
+
+    cache_path = _imagen_cache_path(image_prompt)
+    if cache_path.exists():
+        img_bytes = cache_path.read_bytes()
+        logger.info(f"Using cached Imagen image {cache_path} ({len(img_bytes)} bytes)")
+        return img_bytes, "image/png"
+
     if not GEMINI_API_KEY:
         raise ValueError("Gemini_Api_Key not set in .env")
-    
-    # Create a prompt for image generation based on the post
-    image_prompt = f"""Professional, modern LinkedIn post image about software development and coding.
-
-Visual style: Clean, modern, tech-focused design with professional color scheme. 
-Theme: Coding, GitHub commits, software development, programming.
-Mood: Professional, engaging, inspiring for developers.
-Design elements: Code snippets, GitHub logo, developer tools, clean typography.
-Color palette: Professional blues, greens, or modern gradients.
-Avoid: Cluttered designs, unprofessional imagery.
 
-The post content is about: {post_text[:300]}"""
+    if _imagen_disabled():
+        logger.info("Imagen disabled via cached billing-error flag")
+        return None
 
     try:
         logger.info("Calling Gemini Imagen API...")
@@ -241,47 +389,55 @@ The post content is about: {post_text[:300]}"""
             }
         }
         
-        logger.debug(f"Imagen API URL: {imagen_url}")
-        logger.debug(f"Payload keys: {list(payload.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Imagen API URL: %s", imagen_url)
+            logger.debug("Payload keys: %s", list(payload.keys()))
         
-        response = requests.post(imagen_url, headers=headers, json=payload)
+        response = _RETRY_SESSION.post(imagen_url, headers=headers, data=json_utils.dumps(payload), timeout=LONG_HTTP_TIMEOUT)
         logger.info(f"Gemini API response status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = json_utils.loads(response.content)
             logger.info("Gemini API response received successfully")
-            logger.debug(f"Response keys: {list(result.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response keys: %s", list(result.keys()))
             
             # Imagen API returns predictions array
             if "predictions" in result and len(result["predictions"]) > 0:
                 prediction = result["predictions"][0]
                 logger.info("Image prediction extracted from response")
-                logger.debug(f"Prediction keys: {list(prediction.keys())}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Prediction keys: %s", list(prediction.keys()))
                 
                 # Check for base64 encoded image
                 if "bytesBase64Encoded" in prediction:
-                    logger.info("Using base64 encoded image from prediction")
-                    return f"data:image/png;base64,{prediction['bytesBase64Encoded']}"
-                elif "mimeType" in prediction and "bytesBase64Encoded" in prediction:
                     mime_type = prediction.get("mimeType", "image/png")
-                    logger.info(f"Using base64 encoded image (mime: {mime_type})")
-                    return f"data:{mime_type};base64,{prediction['bytesBase64Encoded']}"
+                    img_bytes = base64.b64decode(prediction["bytesBase64Encoded"])
+                    logger.info(f"Decoded image from prediction ({len(img_bytes)} bytes, mime: {mime_type})")
+                    if mime_type == "image/png":
+                        _store_imagen_cache(cache_path, img_bytes)
+                    return img_bytes, mime_type
                 else:
                     logger.warning("Unexpected Imagen response format - no bytesBase64Encoded found")
-                    logger.debug(f"Prediction structure: {prediction}")
+                    logger.debug("Prediction structure: %s", prediction)
                     return None
             else:
                 logger.warning("No predictions in Gemini response")
-                logger.debug(f"Response structure: {result}")
+                logger.debug("Response structure: %s", result)
                 return None
         elif response.status_code == 400:
-            error_data = response.json()
+            error_data = json_utils.loads(response.content)
             error_msg = error_data.get("error", {}).get("message", "")
             
             if "billed users" in error_msg.lower() or "billing" in error_msg.lower():
                 logger.warning("Imagen API requires a paid Google Cloud account with billing enabled")
                 logger.info("Skipping image generation - Imagen API is not available for free tier")
                 logger.info("Tip: Enable billing in Google Cloud Console to use Imagen API")
+                try:
+                    IMAGEN_DISABLED_FLAG.parent.mkdir(parents=True, exist_ok=True)
+                    IMAGEN_DISABLED_FLAG.write_text(str(time.time() + IMAGEN_DISABLED_TTL))
+                except OSError as e:
+                    logger.warning(f"Could not write {IMAGEN_DISABLED_FLAG}: {e}")
                 return None
             else:
                 logger.error(f"Gemini Imagen API error: {response.status_code}")
@@ -293,26 +449,24 @@ The post content is about: {post_text[:300]}"""
             return None
             
     except requests.exceptions.RequestException as e:
-        logger.error(f"Network error with Gemini API: {e}", exc_info=True)
+        logger.error(f"Network error with Gemini API: {e}")
         return None
     except Exception as e:
         logger.error(f"Unexpected error with Gemini Imagen API: {e}", exc_info=True)
         return None
 
 
-def upload_image_to_linkedin(image_url_or_data):
-    """Upload an image to LinkedIn and get the media URN."""
-    logger.info("Starting LinkedIn image upload process...")
+def register_image_upload():
+    """Register an image upload with LinkedIn and return (upload_url, asset_urn)."""
+    logger.info("Registering image upload with LinkedIn...")
     
     if not ACCESS_TOKEN:
         raise ValueError("access_token not set. Set LINKEDIN_ACCESS_TOKEN secret in GitHub Actions or access_token in .env file.")
     
     try:
-        author_urn = _get_author_urn()
+        author_urn = _cached_author_urn()
         logger.info(f"Got author URN: {author_urn}")
         
-        # Step 1: Register upload
-        logger.info("Registering image upload with LinkedIn...")
         register_url = f"{BASE_URL}/assets?action=registerUpload"
         register_payload = {
             "registerUploadRequest": {
@@ -327,62 +481,74 @@ def upload_image_to_linkedin(image_url_or_data):
             }
         }
         
-        resp = requests.post(
+        resp = _RETRY_SESSION.post(
             register_url,
             headers={
                 "Authorization": f"Bearer {ACCESS_TOKEN}",
                 "Content-Type": "application/json",
-                "X-Restli-Protocol-Version": "2.0.0",
             },
-            json=register_payload,
+            data=json_utils.dumps(register_payload),
+            timeout=HTTP_TIMEOUT,
         )
         resp.raise_for_status()
-        register_data = resp.json()
+        register_data = json_utils.loads(resp.content)
         logger.info("✓ Image upload registered successfully")
         
         upload_url = register_data["value"]["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
         asset_urn = register_data["value"]["asset"]
         logger.info(f"Got upload URL and asset URN: {asset_urn}")
         
-        # Step 2: Get image data
-        logger.info("Preparing image data for upload...")
-        if image_url_or_data.startswith("http"):
-            logger.info("Downloading image from URL...")
-            img_resp = requests.get(image_url_or_data)
-            img_resp.raise_for_status()
-            img_data = img_resp.content
-            logger.info(f"Downloaded image ({len(img_data)} bytes)")
-        elif image_url_or_data.startswith("data:image"):
-            logger.info("Decoding base64 image data...")
-            import base64
-            header, encoded = image_url_or_data.split(",", 1)
-            img_data = base64.b64decode(encoded)
-            logger.info(f"Decoded image ({len(img_data)} bytes)")
-        else:
-            logger.info("Decoding base64 string...")
-            import base64
-            img_data = base64.b64decode(image_url_or_data)
-            logger.info(f"Decoded image ({len(img_data)} bytes)")
-        
-        # Step 3: Upload image
-        logger.info("Uploading image to LinkedIn...")
-        upload_resp = requests.post(
+        return upload_url, asset_urn
+        
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Network error registering LinkedIn image upload: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Error registering LinkedIn image upload: {e}")
+        raise
+
+
+def upload_image_to_linkedin(image_bytes, registration=None, mime_type="image/png"):
+    """Upload raw image bytes to LinkedIn and get the media URN.
+    
+    `registration` is an (upload_url, asset_urn) pair from register_image_upload();
+    when omitted the upload is registered first.
+    """
+    logger.info("Starting LinkedIn image upload process...")
+    
+    if not ACCESS_TOKEN:
+        raise ValueError("access_token not set. Set LINKEDIN_ACCESS_TOKEN secret in GitHub Actions or access_token in .env file.")
+    
+    try:
+        # Step 1: Register upload
+        if registration is None:
+            registration = register_image_upload()
+        upload_url, asset_urn = registration
+        
+        # Step 2: Upload image
+        logger.info(f"Uploading image to LinkedIn ({len(image_bytes)} bytes)...")
+        # The upload ack body is never used, so stream it and close without reading it
+        with _SESSION.post(
             upload_url,
             headers={
                 "Authorization": f"Bearer {ACCESS_TOKEN}",
+                "Content-Type": mime_type,
+                "Content-Length": str(len(image_bytes)),
             },
-            data=img_data,
-        )
-        upload_resp.raise_for_status()
+            data=image_bytes,
+            stream=True,
+            timeout=LONG_HTTP_TIMEOUT,
+        ) as upload_resp:
+            upload_resp.raise_for_status()
         logger.info("✓ Image uploaded successfully")
         
         return asset_urn
         
     except requests.exceptions.RequestException as e:
-        logger.error(f"Network error during LinkedIn image upload: {e}", exc_info=True)
+        logger.error(f"Network error during LinkedIn image upload: {e}")
         raise
     except Exception as e:
-        logger.error(f"Error uploading image to LinkedIn: {e}", exc_info=True)
+        logger.error(f"Error uploading image to LinkedIn: {e}")
         raise
 
 
@@ -409,7 +575,7 @@ def post_to_linkedin_with_image(post_text, image_urn=None):
             raise ValueError("access_token not set in .env file")
     
     try:
-        author_urn = _get_author_urn()
+        author_urn = _cached_author_urn()
         logger.info(f"Using author URN: {author_urn}")
         
         payload = {
@@ -436,14 +602,14 @@ def post_to_linkedin_with_image(post_text, image_urn=None):
             logger.info("Posting text-only (no image)")
         
         logger.info("Sending post to LinkedIn API...")
-        resp = requests.post(
+        resp = _SESSION.post(
             f"{BASE_URL}/ugcPosts",
             headers={
                 "Authorization": f"Bearer {ACCESS_TOKEN}",
                 "Content-Type": "application/json",
-                "X-Restli-Protocol-Version": "2.0.0",
             },
-            json=payload,
+            data=json_utils.dumps(payload),
+            timeout=HTTP_TIMEOUT,
         )
         
         logger.info(f"LinkedIn API response status: {resp.status_code}")
@@ -453,7 +619,7 @@ def post_to_linkedin_with_image(post_text, image_urn=None):
             logger.error(f"Response: {resp.text}")
         
         resp.raise_for_status()
-        result = resp.json()
+        result = json_utils.loads(resp.content)
         logger.info("✓ Post created successfully")
         
         return result
@@ -475,6 +641,11 @@ def run_daily_workflow():
     
     workflow_start_time = datetime.now()
     
+    # Build the DSPy LM in the background while commits are fetched
+    warmup_pool = ThreadPoolExecutor(max_workers=1)
+    lm_future = warmup_pool.submit(_get_lm)
+    warmup_pool.shutdown(wait=False)
+    
     try:
         # Step 1: Fetch GitHub commits from last 24 hours
         logger.info("\n" + "=" * 80)
@@ -489,8 +660,8 @@ def run_daily_workflow():
                 logger.info("ℹ️  No commits found in the last 24 hours. Skipping post.")
                 return
             
-            for i, commit in enumerate(commits, 1):
-                logger.info(f"  Commit {i}: {commit['repository']} - {commit['message'][:50]}...")
+            lines = [f"  Commit {i}: {c['repository']} - {c['message'][:50]}..." for i, c in enumerate(commits, 1)]
+            logger.info("Fetched commits:\n%s", "\n".join(lines))
                 
         except Exception as e:
             logger.error(f"❌ Error fetching GitHub commits: {e}", exc_info=True)
@@ -504,7 +675,7 @@ def run_daily_workflow():
         try:
             commits_summary = format_commits_for_analysis(commits)
             logger.info(f"✓ Formatted {len(commits)} commit(s)")
-            logger.debug(f"Summary length: {len(commits_summary)} characters")
+            logger.debug("Summary length: %d characters", len(commits_summary))
         except Exception as e:
             logger.error(f"❌ Error formatting commits: {e}", exc_info=True)
             raise
@@ -515,7 +686,7 @@ def run_daily_workflow():
         logger.info("=" * 80)
         
         try:
-            post_text = analyze_commits_with_dspy(commits_summary)
+            post_text = analyze_commits_with_dspy(commits_summary, lm_future)
             logger.info("✓ LinkedIn post generated")
             logger.info(f"\n📄 Generated Post:\n{post_text}\n")
         except Exception as e:
@@ -528,27 +699,55 @@ def run_daily_workflow():
         logger.info("=" * 80)
         
         image_urn = None
-        image_url = None
-        
-        try:
-            image_url = generate_image_with_gemini(post_text)
-            if image_url:
-                logger.info("✓ Image generated successfully")
+        image = None
+        cached_image = _imagen_cache_path(build_image_prompt(post_text)).exists()
+        
+        # Only register a LinkedIn upload when an image can actually be produced
+        if not cached_image and not GEMINI_API_KEY:
+            logger.info("ℹ️  Gemini_Api_Key not set, posting text-only")
+        elif not cached_image and _imagen_disabled():
+            logger.info(f"ℹ️  Imagen disabled after a billing error (remove {IMAGEN_DISABLED_FLAG} to retry sooner), posting text-only")
+        else:
+            try:
+                registration = None
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    image_future = pool.submit(generate_image_with_gemini, post_text)
+                    if cached_image:
+                        # A cached image is just a disk read; register once it is in hand
+                        image = image_future.result()
+                        register_future = pool.submit(register_image_upload) if image else None
+                    else:
+                        # Register the LinkedIn upload while Imagen renders so the slower
+                        # call hides the LinkedIn round-trips. If Imagen comes back empty
+                        # the registration is never uploaded to and simply goes unused.
+                        register_future = pool.submit(register_image_upload)
+                        image = image_future.result()
+                    if image and register_future:
+                        try:
+                            registration = register_future.result()
+                        except Exception as e:
+                            logger.warning(f"⚠️  Image upload registration failed: {e}")
                 
-                # Download and upload to LinkedIn
-                logger.info("📤 Uploading image to LinkedIn...")
-                try:
-                    image_urn = upload_image_to_linkedin(image_url)
-                    logger.info(f"✓ Image uploaded, URN: {image_urn}")
-                except Exception as e:
-                    logger.warning(f"⚠️  Image upload failed: {e}")
-                    logger.info("ℹ️  Continuing with text-only post")
-                    image_urn = None
-            else:
-                logger.info("ℹ️  No image generated, posting text-only")
-        except Exception as e:
-            logger.warning(f"⚠️  Image generation/upload skipped: {e}")
-            logger.info("ℹ️  Continuing with text-only post")
+                if image and registration:
+                    logger.info("✓ Image generated successfully")
+                    
+                    # Upload to LinkedIn
+                    logger.info("📤 Uploading image to LinkedIn...")
+                    try:
+                        image_bytes, mime_type = image
+                        image_urn = upload_image_to_linkedin(image_bytes, registration, mime_type)
+                        logger.info(f"✓ Image uploaded, URN: {image_urn}")
+                    except Exception as e:
+                        logger.warning(f"⚠️  Image upload failed: {e}")
+                        logger.info("ℹ️  Continuing with text-only post")
+                        image_urn = None
+                elif image:
+                    logger.info("ℹ️  Image generated but upload could not be registered, posting text-only")
+                else:
+                    logger.info("ℹ️  No image generated, posting text-only")
+            except Exception as e:
+                logger.warning(f"⚠️  Image generation/upload skipped: {e}")
+                logger.info("ℹ️  Continuing with text-only post")
         
         # Step 5: Post to LinkedIn
         logger.info("\n" + "=" * 80)
@@ -1,7 +1,17 @@
+import io
 import os
+import re
+import threading
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
 from dotenv import load_dotenv
+import json_utils
 
 load_dotenv()
 
@@ -9,84 +19,384 @@ GITHUB_TOKEN = os.environ.get("GIT_TOKEN", "").strip()
 GITHUB_USERNAME = os.environ.get("GIT_USERNAME", "").strip()
 
 BASE_URL = "https://api.github.com"
+GRAPHQL_URL = f"{BASE_URL}/graphql"
 
+# Concurrent GitHub requests when fanning out over repos, commits and pages
+MAX_WORKERS = 20
 
-def get_user_repos(username, token=None):
+# Page size for paginated REST list endpoints (GitHub's maximum)
+PER_PAGE = 100
+
+# Rule between sections in printed and formatted summaries
+SEPARATOR = "=" * 80
+
+# Emoji per file status in rendered summaries
+STATUS_EMOJI = {
+    "added": "➕",
+    "removed": "➖",
+    "modified": "✏️",
+    "renamed": "📝",
+}
+
+# Per-file diff limits in the AI summary
+PATCH_MAX_LINES = 500
+PATCH_MAX_CHARS = 2000
+
+# Git's C-style escapes in quoted diff paths: \ooo octal bytes and single-char escapes
+_GIT_QUOTED_ESCAPE = re.compile(rb'\\([0-7]{3}|.)')
+_GIT_ESCAPES = {b"a": b"\a", b"b": b"\b", b"t": b"\t", b"n": b"\n", b"v": b"\v", b"f": b"\f", b"r": b"\r"}
+
+# Local cache for conditional requests and commit details
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "gh-summarizer"
+COMMIT_CACHE_DIR = CACHE_DIR / "commits"
+# Cached commit details outlive the 24h window only long enough to serve a retried run
+COMMIT_CACHE_MAX_AGE = timedelta(hours=48)
+
+# (connect, read) timeout in seconds for every GitHub request
+HTTP_TIMEOUT = (5, 30)
+
+# One pooled session shared by all GitHub calls (and threads), so TLS connections
+# are reused. Every request here is a read, so GraphQL POSTs are retried as well.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            raise_on_status=False,
+        ),
+    ),
+)
+_SESSION.headers.update({"Accept": "application/vnd.github.v3+json"})
+
+# Public non-fork repos owned by the user, most recently pushed first, with each
+# default branch's commits since $since (same scope as the REST path).
+COMMITS_QUERY = """
+query($login: String!, $since: GitTimestamp!, $cursor: String) {
+  user(login: $login) {
+    repositories(first: 50, after: $cursor, ownerAffiliations: OWNER, privacy: PUBLIC, isFork: false,
+                 orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        nameWithOwner
+        name
+        owner { login }
+        pushedAt
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(since: $since, first: 100) {
+                pageInfo { hasNextPage }
+                nodes { oid url message author { name date user { login } } }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def _auth_headers(token):
+    """Per-request auth header; everything else comes from the session defaults."""
+    return {"Authorization": f"token {token}"} if token else {}
+
+
+class _EtagCache:
+    """On-disk {url: {"etag", "payload", "last_page"}} store for GitHub conditional requests.
+    
+    Callers only store stable URLs (not commit lists filtered by a moving
+    `since`), and save() merges this run's entries over the loaded ones so a
+    run that skips a URL doesn't drop its entry.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._entries = None
+        self._used = {}
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        if self._entries is None:
+            try:
+                self._entries = json_utils.loads(self.path.read_bytes())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+    
+    def get(self, key):
+        with self._lock:
+            return self._used.get(key) or self._load().get(key)
+    
+    def put(self, key, etag, payload, last_page=1):
+        with self._lock:
+            self._used[key] = {"etag": etag, "payload": payload, "last_page": last_page}
+    
+    def touch(self, key, entry):
+        with self._lock:
+            self._used[key] = entry
+    
+    def save(self):
+        with self._lock:
+            if not self._used:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.path.write_bytes(json_utils.dumps({**self._load(), **self._used}))
+            except OSError as e:
+                print(f"Could not write ETag cache {self.path}: {e}")
+
+
+_ETAG_CACHE = _EtagCache(CACHE_DIR / "etags.json")
+
+
+def _last_page(response):
+    """Page count from a paginated response's Link header (1 when there is no rel="last")."""
+    last_url = response.links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+    return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+
+
+def _cached_get(url, params=None, token=None, headers=None, store=True):
+    """GET a GitHub JSON resource, revalidating a cached copy with If-None-Match.
+    
+    Returns (payload, last_page), where last_page comes from the Link header.
+    A 304 returns the cached payload without counting against the rate limit.
+    A 304 with nothing cached (e.g. from an If-Modified-Since in `headers`)
+    returns (None, 1). With store=False the response is never cached.
+    """
+    key = f"{url}?{urlencode(params)}" if params else url
+    entry = _ETAG_CACHE.get(key)
+    
+    headers = {**_auth_headers(token), **(headers or {})}
+    if entry:
+        headers["If-None-Match"] = entry["etag"]
+    
+    response = _SESSION.get(url, headers=headers, params=params, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304:
+        if not entry:
+            return None, 1
+        _ETAG_CACHE.touch(key, entry)
+        return entry["payload"], entry.get("last_page", 1)
+    response.raise_for_status()
+    
+    payload = json_utils.loads(response.content)
+    last_page = _last_page(response)
+    etag = response.headers.get("ETag")
+    if etag and store:
+        _ETAG_CACHE.put(key, etag, payload, last_page)
+    return payload, last_page
+
+
+def _get_all_pages(url, params, token=None, first_page_headers=None, max_workers=MAX_WORKERS):
+    """GET every page of a paginated GitHub list endpoint.
+    
+    Page 1's Link header gives the last page number, so the remaining pages
+    are fetched on up to max_workers threads (1 fetches them in order on the
+    calling thread) and no trailing empty page is requested.
+    Returns None if page 1 came back as a bodyless 304.
+    """
+    params = {**params, "per_page": PER_PAGE}
+    # If-Modified-Since marks a query keyed by a moving `since`, whose URL never recurs
+    store = "If-Modified-Since" not in (first_page_headers or {})
+    items, last_page = _cached_get(url, {**params, "page": 1}, token, first_page_headers, store)
+    if items is None or last_page <= 1:
+        return items
+    items = list(items)  # Page 1's payload is also held by the ETag cache
+    
+    def fetch_page(page):
+        page_items, _ = _cached_get(url, {**params, "page": page}, token, store=store)
+        return page_items or []
+    
+    pages = range(2, last_page + 1)
+    if max_workers <= 1:
+        for page in pages:
+            items.extend(fetch_page(page))
+        return items
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pages))) as pool:
+        for page_items in pool.map(fetch_page, pages):
+            items.extend(page_items)
+    
+    return items
+
+
+def get_user_repos(username, token=None, max_workers=MAX_WORKERS):
     """Get all repositories for a GitHub user."""
-    headers = {}
-    if token:
-        headers["Authorization"] = f"token {token}"
+    url = f"{BASE_URL}/users/{username}/repos"
+    return _get_all_pages(url, {"type": "owner", "sort": "updated"}, token, max_workers=max_workers)
+
+
+def get_repo_commits(owner, repo, since, token=None, author=None, max_workers=MAX_WORKERS):
+    """Get commits from a repository since a specific (timezone-aware UTC) time, optionally by one author."""
+    url = f"{BASE_URL}/repos/{owner}/{repo}/commits"
+    params = {"since": since.isoformat()}
+    if author:
+        params["author"] = author
     
-    repos = []
-    page = 1
-    per_page = 100
+    # A repo untouched since the window answers the first page with a bodyless 304
+    headers = {"If-Modified-Since": format_datetime(since, usegmt=True)}
+    try:
+        commits = _get_all_pages(url, params, token, headers, max_workers)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 409:  # Empty repository
+            return []
+        raise
     
-    while True:
-        url = f"{BASE_URL}/users/{username}/repos?page={page}&per_page={per_page}&sort=updated"
-        response = requests.get(url, headers=headers)
+    return commits or []
+
+
+def get_commit_details(owner, repo, sha, token=None):
+    """Get detailed commit information including diff.
+    
+    Files and stats come from the plain-text .diff rendering, which is much
+    smaller than the JSON payload. Commits are immutable, so results are cached
+    on disk by SHA; prune_commit_cache() drops entries past COMMIT_CACHE_MAX_AGE.
+    """
+    cache_path = COMMIT_CACHE_DIR / owner / repo / f"{sha}.json"
+    try:
+        return json_utils.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        pass
+    
+    try:
+        files = parse_diff(iter_commit_diff(owner, repo, sha, token))
+        details = {"files": files, "stats": diff_stats(files)}
+    except requests.HTTPError:
+        # GitHub refuses .diff for very large commits; the JSON endpoint still works
+        url = f"{BASE_URL}/repos/{owner}/{repo}/commits/{sha}"
+        response = _SESSION.get(url, headers=_auth_headers(token), timeout=HTTP_TIMEOUT)
         response.raise_for_status()
-        
-        page_repos = response.json()
-        if not page_repos:
-            break
-        
-        repos.extend(page_repos)
-        page += 1
-        
-        # If we got fewer than per_page, we're done
-        if len(page_repos) < per_page:
-            break
+        details = json_utils.loads(response.content)
+    
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(json_utils.dumps(details))
+    except OSError as e:
+        print(f"Could not cache commit {owner}/{repo}@{sha[:7]}: {e}")
     
-    return repos
+    return details
+
 
+def prune_commit_cache():
+    """Delete cached commit details written more than COMMIT_CACHE_MAX_AGE ago."""
+    cutoff = (datetime.now() - COMMIT_CACHE_MAX_AGE).timestamp()
+    for path in COMMIT_CACHE_DIR.glob("*/*/*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
 
-def get_repo_commits(owner, repo, since, token=None):
-    """Get commits from a repository since a specific time."""
-    headers = {"Accept": "application/vnd.github.v3+json"}
-    if token:
-        headers["Authorization"] = f"token {token}"
+
+def iter_commit_diff(owner, repo, sha, token=None):
+    """Stream a commit's unified diff line by line (without line endings).
     
-    commits = []
-    page = 1
-    per_page = 100
+    The compressed response is decoded as it arrives, so the full diff text is
+    never held in memory alongside the parsed files.
+    """
+    headers = _auth_headers(token)
+    headers["Accept"] = "application/vnd.github.v3.diff"
     
-    while True:
-        url = f"{BASE_URL}/repos/{owner}/{repo}/commits"
-        params = {
-            "since": since.isoformat(),
-            "page": page,
-            "per_page": per_page,
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 409:  # Empty repository
-            break
+    url = f"{BASE_URL}/repos/{owner}/{repo}/commits/{sha}"
+    with _SESSION.get(url, headers=headers, timeout=HTTP_TIMEOUT, stream=True) as response:
         response.raise_for_status()
-        
-        page_commits = response.json()
-        if not page_commits:
-            break
-        
-        commits.extend(page_commits)
-        page += 1
-        
-        if len(page_commits) < per_page:
-            break
+        response.raw.decode_content = True
+        response.raw.auto_close = False  # TextIOWrapper needs the stream open until EOF
+        text = io.TextIOWrapper(response.raw, encoding=response.encoding or "utf-8", errors="replace", newline="\n")
+        for line in text:
+            yield line[:-1] if line.endswith("\n") else line
+
+
+def _diff_path(raw, prefix=""):
+    """Decode a path as git prints it in diff headers and strip its a/ or b/ prefix.
     
-    return commits
+    Names with spaces get a trailing tab on ---/+++ lines, and names with
+    non-ASCII or special characters are C-quoted, e.g. "b/\\303\\251.txt".
+    """
+    raw = raw.removesuffix("\t")
+    if len(raw) >= 2 and raw.startswith('"') and raw.endswith('"'):
+        quoted = raw[1:-1].encode("utf-8")
+        raw = _GIT_QUOTED_ESCAPE.sub(
+            lambda m: bytes([int(m[1], 8)]) if len(m[1]) == 3 else _GIT_ESCAPES.get(m[1], m[1]),
+            quoted,
+        ).decode("utf-8", errors="replace")
+    return raw.removeprefix(prefix)
 
 
-def get_commit_details(owner, repo, sha, token=None):
-    """Get detailed commit information including diff."""
-    headers = {"Accept": "application/vnd.github.v3+json"}
-    if token:
-        headers["Authorization"] = f"token {token}"
+def _diff_header_path(header):
+    """The b/ path from a `diff --git a/... b/...` header, quoted or not."""
+    if header.endswith('"'):
+        start = header.rfind(' "b/')
+        if start != -1:
+            return _diff_path(header[start + 1:], "b/")
+    return header.rsplit(" b/", 1)[-1]
+
+
+def parse_diff(lines):
+    """Parse unified diff lines into file dicts shaped like the REST API's `files` entries."""
+    files = []
+    current = None
+    in_hunks = False
     
-    url = f"{BASE_URL}/repos/{owner}/{repo}/commits/{sha}"
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+    for line in lines:
+        if line.startswith("diff --git "):
+            # Fallback name from the header; refined by the ---/+++/rename lines below
+            current = {
+                "filename": _diff_header_path(line),
+                "status": "modified",
+                "additions": 0,
+                "deletions": 0,
+                "changes": 0,
+                "patch": [],
+            }
+            files.append(current)
+            in_hunks = False
+        elif current is None:
+            continue
+        elif in_hunks or line.startswith("@@"):
+            in_hunks = True
+            current["patch"].append(line)
+            if line.startswith("+"):
+                current["additions"] += 1
+            elif line.startswith("-"):
+                current["deletions"] += 1
+        elif line.startswith("new file mode"):
+            current["status"] = "added"
+        elif line.startswith("deleted file mode"):
+            current["status"] = "removed"
+        elif line.startswith("rename to "):
+            current["status"] = "renamed"
+            current["filename"] = _diff_path(line[len("rename to "):])
+        elif line.startswith("--- ") and current["status"] == "removed":
+            current["filename"] = _diff_path(line[len("--- "):], "a/")
+        elif line.startswith("+++ ") and line != "+++ /dev/null":
+            current["filename"] = _diff_path(line[len("+++ "):], "b/")
+    
+    for file in files:
+        patch = file["patch"]
+        # A diff ends with a newline, which leaves one empty trailing line
+        while patch and not patch[-1]:
+            patch.pop()
+        file["patch"] = "\n".join(patch)
+        file["changes"] = file["additions"] + file["deletions"]
     
-    return response.json()
+    return files
+
+
+def diff_stats(files):
+    """Total additions/deletions/changes across parsed diff files, like the REST `stats` block."""
+    additions = sum(file["additions"] for file in files)
+    deletions = sum(file["deletions"] for file in files)
+    return {"additions": additions, "deletions": deletions, "total": additions + deletions}
 
 
 def summarize_diff(files):
@@ -112,71 +422,251 @@ def summarize_diff(files):
     return summary
 
 
-def format_commits_for_analysis(commits):
-    """Format commits into a clear, detailed summary for AI analysis."""
+def truncate_patch(patch):
+    """Limit a patch to PATCH_MAX_LINES lines and PATCH_MAX_CHARS characters to avoid token limits.
+    
+    Returns (patch, truncation_note), where the note is None if nothing was cut.
+    Only the first PATCH_MAX_CHARS characters are scanned, so huge patches are
+    never split into lists of lines.
+    """
+    head = patch[:PATCH_MAX_CHARS]
+    if head.count('\n') >= PATCH_MAX_LINES:
+        end = -1
+        for _ in range(PATCH_MAX_LINES):
+            end = head.find('\n', end + 1)
+        remaining = patch.count('\n') + 1 - PATCH_MAX_LINES
+        return head[:end], f"... (truncated, {remaining} more lines)"
+    if len(patch) > PATCH_MAX_CHARS:
+        return head, "... (truncated)"
+    return patch, None
+
+
+def iter_commits_for_analysis(commits):
+    """Yield the parts of the AI-analysis summary one at a time, to be joined with newlines.
+    
+    Lets a consumer that can stream (e.g. a chunked request body) avoid
+    building the whole summary string.
+    """
     if not commits:
-        return "No commits found in the last 24 hours."
+        yield "No commits found in the last 24 hours."
+        return
     
-    summary_parts = []
-    summary_parts.append(f"📊 GitHub Activity Summary - Last 24 Hours")
-    summary_parts.append(f"Total Commits: {len(commits)}\n")
+    yield f"📊 GitHub Activity Summary - Last 24 Hours"
+    yield f"Total Commits: {len(commits)}\n"
     
     for i, commit in enumerate(commits, 1):
-        summary_parts.append(f"{'='*80}")
-        summary_parts.append(f"Commit #{i}: {commit['repository']}")
-        summary_parts.append(f"{'='*80}")
-        summary_parts.append(f"🔗 URL: {commit['url']}")
-        summary_parts.append(f"👤 Author: {commit['author']}")
-        summary_parts.append(f"📅 Date: {commit['date']}")
-        summary_parts.append(f"💬 Message: {commit['message']}")
+        yield SEPARATOR
+        yield f"Commit #{i}: {commit['repository']}"
+        yield SEPARATOR
+        yield f"🔗 URL: {commit['url']}"
+        yield f"👤 Author: {commit['author']}"
+        yield f"📅 Date: {commit['date']}"
+        yield f"💬 Message: {commit['message']}"
         
         stats = commit.get('stats', {})
-        summary_parts.append(f"\n📈 Statistics:")
-        summary_parts.append(f"  • Files Changed: {len(commit['files'])}")
-        summary_parts.append(f"  • Total Additions: +{stats.get('additions', 0)}")
-        summary_parts.append(f"  • Total Deletions: -{stats.get('deletions', 0)}")
-        summary_parts.append(f"  • Total Changes: {stats.get('total', 0)} lines")
+        yield f"\n📈 Statistics:"
+        yield f"  • Files Changed: {len(commit['files'])}"
+        yield f"  • Total Additions: +{stats.get('additions', 0)}"
+        yield f"  • Total Deletions: -{stats.get('deletions', 0)}"
+        yield f"  • Total Changes: {stats.get('total', 0)} lines"
         
-        summary_parts.append(f"\n📁 Files Changed:")
+        yield f"\n📁 Files Changed:"
         for file_info in commit['files']:
-            status_emoji = {
-                "added": "➕",
-                "removed": "➖",
-                "modified": "✏️",
-                "renamed": "📝",
-            }.get(file_info['status'], "📄")
+            status_emoji = STATUS_EMOJI.get(file_info['status'], "📄")
             
-            summary_parts.append(f"\n  {status_emoji} {file_info['file']} ({file_info['status'].upper()})")
-            summary_parts.append(f"     +{file_info['additions']} -{file_info['deletions']} lines")
+            yield f"\n  {status_emoji} {file_info['file']} ({file_info['status'].upper()})"
+            yield f"     +{file_info['additions']} -{file_info['deletions']} lines"
             
             # Include code diff if available (truncate if too long)
             if file_info.get('patch'):
-                patch = file_info['patch']
-                # Limit patch to first 500 lines to avoid token limits
-                patch_lines = patch.split('\n')
-                if len(patch_lines) > 500:
-                    patch = '\n'.join(patch_lines[:500]) + f"\n... (truncated, {len(patch_lines) - 500} more lines)"
-                summary_parts.append(f"\n     Code Changes:")
-                summary_parts.append(f"     {patch[:2000]}")  # Limit to 2000 chars per file
-                if len(patch) > 2000:
-                    summary_parts.append(f"     ... (truncated)")
+                patch, truncation_note = truncate_patch(file_info['patch'])
+                yield f"\n     Code Changes:"
+                yield f"     {patch}"
+                if truncation_note:
+                    yield f"     {truncation_note}"
+        
+        yield "\n"
+
+
+def format_commits_for_analysis(commits):
+    """Format commits into a clear, detailed summary for AI analysis."""
+    return "\n".join(iter_commits_for_analysis(commits))
+
+
+def get_all_commits_rest(username, since, token=None, max_workers=MAX_WORKERS):
+    """List (repo_full_name, owner, repo, commit) tuples since `since` by walking every repo over REST."""
+    # Get all repositories
+    print(f"Fetching repositories for {username}...")
+    repos = get_user_repos(username, token, max_workers)
+    print(f"Found {len(repos)} repositories\n")
+    
+    # Forks are skipped, and a repo last pushed before the window can't have new commits
+    repos = [
+        repo for repo in repos
+        if not repo.get("fork") and repo.get("pushed_at") and datetime.fromisoformat(repo["pushed_at"]) >= since
+    ]
+    print(f"{len(repos)} repositories pushed since {since.isoformat()}\n")
+    
+    def fetch_repo(repo):
+        repo_name = repo["full_name"]
+        owner = repo["owner"]["login"]
+        repo_name_only = repo["name"]
         
-        summary_parts.append("\n")
+        try:
+            # Already on a pool worker: page through this repo in order rather than nesting pools
+            commits = get_repo_commits(owner, repo_name_only, since, token, author=username, max_workers=1)
+        except Exception as e:
+            print(f"Error fetching commits from {repo_name}: {e}")
+            return []
+        if commits:
+            print(f"Found {len(commits)} commit(s) in {repo_name}")
+        return [(repo_name, owner, repo_name_only, commit) for commit in commits]
     
-    return "\n".join(summary_parts)
+    # Get commits from each repository concurrently
+    all_commits = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for repo_commits in pool.map(fetch_repo, repos):
+            all_commits.extend(repo_commits)
+    
+    return all_commits
+
 
+def _utc_timestamp(value):
+    """Normalize a GraphQL GitTimestamp (author's own offset) to REST's UTC "...Z" form."""
+    if not value:
+        return value
+    return datetime.fromisoformat(value).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-def fetch_commits_from_last_24_hours(username=None, token=None):
-    """Fetch all commits from user's repositories in the last 24 hours."""
+
+def get_all_commits_graphql(username, since, token, max_workers=MAX_WORKERS):
+    """List (repo_full_name, owner, repo, commit) tuples since `since` with one GraphQL query per page of repos.
+    
+    Commits are returned in the same shape as the REST list-commits endpoint so
+    callers can treat both sources alike. Repos are walked newest-push first and
+    paging stops at the first repo last pushed before `since`.
+    """
+    headers = {"Authorization": f"bearer {token}"}
+    variables = {
+        "login": username,
+        "since": since.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "cursor": None,
+    }
+    
+    all_commits = []
+    while True:
+        response = _SESSION.post(
+            GRAPHQL_URL,
+            headers=headers,
+            json={"query": COMMITS_QUERY, "variables": variables},
+            timeout=HTTP_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = json_utils.loads(response.content)
+        if data.get("errors"):
+            raise RuntimeError(data["errors"][0].get("message", "GraphQL error"))
+        
+        user = data["data"]["user"]
+        if user is None:
+            raise ValueError(f"GitHub user '{username}' not found")
+        repositories = user["repositories"]
+        
+        reached_stale_repos = False
+        for repo in repositories["nodes"]:
+            pushed_at = repo.get("pushedAt")
+            if not pushed_at:  # Never pushed
+                continue
+            if pushed_at < variables["since"]:
+                reached_stale_repos = True
+                break
+            
+            branch = repo.get("defaultBranchRef")
+            if not branch:  # Empty repository
+                continue
+            history = branch["target"]["history"]
+            repo_name = repo["nameWithOwner"]
+            owner = repo["owner"]["login"]
+            name = repo["name"]
+            
+            if history["pageInfo"]["hasNextPage"]:
+                # More than one page of commits in the window; let REST paginate it
+                commits = get_repo_commits(owner, name, since, token, author=username, max_workers=max_workers)
+            else:
+                commits = []
+                for node in history["nodes"]:
+                    author = node["author"] or {}  # Null when the commit has no parseable author
+                    if (author.get("user") or {}).get("login", "").lower() != username.lower():
+                        continue
+                    commits.append({
+                        "sha": node["oid"],
+                        "html_url": node["url"],
+                        "commit": {
+                            "message": node["message"],
+                            "author": {
+                                "name": author.get("name"),
+                                "date": _utc_timestamp(author.get("date")),
+                            },
+                        },
+                    })
+            
+            if commits:
+                print(f"Found {len(commits)} commit(s) in {repo_name}")
+                all_commits.extend([(repo_name, owner, name, commit) for commit in commits])
+        
+        page_info = repositories["pageInfo"]
+        if reached_stale_repos or not page_info["hasNextPage"]:
+            break
+        variables["cursor"] = page_info["endCursor"]
+    
+    return all_commits
+
+
+def build_commit_info(repo_name, commit):
+    """Build the commit dict from list-endpoint data alone; files and stats start empty."""
+    return {
+        "repository": repo_name,
+        "sha": commit["sha"][:7],
+        "message": commit["commit"]["message"],
+        "author": commit["commit"]["author"]["name"],
+        "date": commit["commit"]["author"]["date"],
+        "url": commit["html_url"],
+        "files": [],
+        "stats": {},
+    }
+
+
+def get_commit_info(repo_name, owner, repo, commit, token=None):
+    """Build the commit dict including files and stats, or None if its details can't be fetched."""
+    sha = commit["sha"]
+    
+    try:
+        details = get_commit_details(owner, repo, sha, token)
+    except Exception as e:
+        print(f"Error fetching details for {repo_name}/{sha[:7]}: {e}")
+        return None
+    
+    commit_info = build_commit_info(repo_name, commit)
+    commit_info["files"] = summarize_diff(details.get("files", []))
+    commit_info["stats"] = details.get("stats", {})  # Total additions, deletions, changes
+    return commit_info
+
+
+def fetch_commits_from_last_24_hours(username=None, token=None, include_files=True, max_workers=MAX_WORKERS):
+    """Fetch all commits from user's repositories in the last 24 hours.
+    
+    With include_files=False only the commit list is fetched; each commit's
+    files and stats are left empty and no per-commit detail requests are made.
+    Per-repo, per-page and per-commit requests run on up to max_workers
+    threads (1 makes them sequential); values above MAX_WORKERS exceed the
+    session's connection pool and gain nothing.
+    """
     if not username:
         username = GITHUB_USERNAME
     
     if not username:
-        # Debug: Check what's actually in the environment
-        env_vars = {k: v for k, v in os.environ.items() if 'GIT' in k or 'GITHUB' in k}
+        # Debug: list the GitHub-related env vars that are set (names only, never values)
         raise ValueError(
             f"GitHub username required. Set GIT_USERNAME in .env or pass as argument.\n"
-            f"Current env vars: {env_vars}\n"
+            f"Current env vars: {sorted(k for k, v in os.environ.items() if v and ('GIT' in k or 'GITHUB' in k))}\n"
             f"GIT_USERNAME value: '{GITHUB_USERNAME}'"
         )
     
@@ -187,61 +677,32 @@ def fetch_commits_from_last_24_hours(username=None, token=None):
         raise ValueError("GitHub token required. Set GIT_TOKEN in .env or pass as argument.")
     
     # Calculate 24 hours ago
-    since = datetime.utcnow() - timedelta(hours=24)
+    since = datetime.now(timezone.utc) - timedelta(hours=24)
     
     print(f"Fetching commits from {username}'s repositories since {since.isoformat()}")
-    print("=" * 80)
+    print(SEPARATOR)
     
-    # Get all repositories
-    print(f"Fetching repositories for {username}...")
-    repos = get_user_repos(username, token)
-    print(f"Found {len(repos)} repositories\n")
+    try:
+        print(f"Fetching recent commits for {username} via GraphQL...")
+        all_commits = get_all_commits_graphql(username, since, token, max_workers)
+    except Exception as e:
+        print(f"GraphQL commit discovery failed ({e}), falling back to REST\n")
+        all_commits = get_all_commits_rest(username, since, token, max_workers)
     
-    all_commits = []
+    print(f"\nTotal commits found: {len(all_commits)}\n")
     
-    # Get commits from each repository
-    for repo in repos:
-        repo_name = repo["full_name"]
-        owner = repo["owner"]["login"]
-        repo_name_only = repo["name"]
-        
-        try:
-            commits = get_repo_commits(owner, repo_name_only, since, token)
-            if commits:
-                print(f"Found {len(commits)} commit(s) in {repo_name}")
-                all_commits.extend([(repo_name, commit) for commit in commits])
-        except Exception as e:
-            print(f"Error fetching commits from {repo_name}: {e}")
-            continue
+    if not include_files:
+        _ETAG_CACHE.save()
+        return [build_commit_info(repo_name, commit) for repo_name, _, _, commit in all_commits]
     
-    print(f"\nTotal commits found: {len(all_commits)}\n")
+    # Get detailed information for each commit concurrently, keeping the original order
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        infos = list(pool.map(lambda entry: get_commit_info(*entry, token), all_commits))
     
-    # Get detailed information for each commit
-    results = []
-    for repo_name, commit in all_commits:
-        owner, repo = repo_name.split("/")
-        sha = commit["sha"]
-        
-        try:
-            details = get_commit_details(owner, repo, sha, token)
-            
-            commit_info = {
-                "repository": repo_name,
-                "sha": sha[:7],
-                "message": commit["commit"]["message"],
-                "author": commit["commit"]["author"]["name"],
-                "date": commit["commit"]["author"]["date"],
-                "url": commit["html_url"],
-                "files": summarize_diff(details.get("files", [])),
-                "stats": details.get("stats", {}),  # Total additions, deletions, changes
-            }
-            
-            results.append(commit_info)
-        except Exception as e:
-            print(f"Error fetching details for {repo_name}/{sha[:7]}: {e}")
-            continue
+    _ETAG_CACHE.save()
+    prune_commit_cache()
     
-    return results
+    return [info for info in infos if info is not None]
 
 
 def print_commit_summary(commits):
@@ -251,9 +712,9 @@ def print_commit_summary(commits):
         return
     
     for i, commit in enumerate(commits, 1):
-        print(f"\n{'='*80}")
+        print(f"\n{SEPARATOR}")
         print(f"Commit #{i}")
-        print(f"{'='*80}")
+        print(SEPARATOR)
         print(f"Repository: {commit['repository']}")
         print(f"SHA: {commit['sha']}")
         print(f"Author: {commit['author']}")
@@ -264,12 +725,7 @@ def print_commit_summary(commits):
         print(f"\nFiles Changed ({len(commit['files'])}):")
         
         for file_info in commit['files']:
-            status_emoji = {
-                "added": "➕",
-                "removed": "➖",
-                "modified": "✏️",
-                "renamed": "📝",
-            }.get(file_info['status'], "📄")
+            status_emoji = STATUS_EMOJI.get(file_info['status'], "📄")
             
             print(f"  {status_emoji} {file_info['status'].upper():8} | "
                   f"+{file_info['additions']:3} -{file_info['deletions']:3} | "
@@ -282,9 +738,9 @@ if __name__ == "__main__":
         print_commit_summary(commits)
         
         # Return commits as structured data for further processing
-        print(f"\n\n{'='*80}")
+        print(f"\n\n{SEPARATOR}")
         print(f"Summary: Found {len(commits)} commit(s) in the last 24 hours")
-        print(f"{'='*80}")
+        print(SEPARATOR)
         
     except Exception as e:
         print(f"Error: {e}")
@@ -23,10 +23,8 @@ def extract_from_id_token():
         if len(parts) >= 2:
             # Decode the payload (second part)
             payload = parts[1]
-            # Add padding if needed
-            padding = 4 - len(payload) % 4
-            if padding != 4:
-                payload += '=' * padding
+            # Restore the base64 padding JWTs strip (0-3 '=' characters)
+            payload += '=' * (-len(payload) % 4)
             decoded = base64.urlsafe_b64decode(payload)
             data = json.loads(decoded)
             person_id = data.get("sub", "")
@@ -46,6 +44,7 @@ resp = requests.get(
         "Authorization": f"Bearer {ACCESS_TOKEN}",
         "X-Restli-Protocol-Version": "2.0.0",
     },
+    timeout=30,
 )
 
 if resp.status_code == 200:
@@ -42,6 +42,7 @@ token_response = requests.post(
         "client_id": CLIENT_ID,
         "client_secret": CLIENT_SECRET,
     },
+    timeout=30,
 )
 
 print("\nResponse:")
@@ -9,17 +9,22 @@ ACCESS_TOKEN = os.environ.get("access_token", "")
 PERSON_URN = os.environ.get("PERSON_URN", "").strip()
 BASE_URL = "https://api.linkedin.com/v2"
 
+# (connect, read) timeout in seconds for LinkedIn requests
+HTTP_TIMEOUT = (5, 30)
+
+# One session per process so the /me lookup and the post share a TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({"X-Restli-Protocol-Version": "2.0.0"})
+
 
 def _get_author_urn():
     """Get author URN: from /v2/me if allowed, else from PERSON_URN in .env."""
     if PERSON_URN:
         return PERSON_URN if PERSON_URN.startswith("urn:li:person:") else f"urn:li:person:{PERSON_URN}"
-    resp = requests.get(
+    resp = _SESSION.get(
         f"{BASE_URL}/me",
-        headers={
-            "Authorization": f"Bearer {ACCESS_TOKEN}",
-            "X-Restli-Protocol-Version": "2.0.0",
-        },
+        headers={"Authorization": f"Bearer {ACCESS_TOKEN}"},
+        timeout=HTTP_TIMEOUT,
     )
     if resp.status_code == 403:
         raise ValueError(
@@ -54,14 +59,14 @@ def upload_sample_post(text: str = "Hello from github-commit-summarizer! This is
         "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"},
     }
 
-    resp = requests.post(
+    resp = _SESSION.post(
         f"{BASE_URL}/ugcPosts",
         headers={
             "Authorization": f"Bearer {ACCESS_TOKEN}",
             "Content-Type": "application/json",
-            "X-Restli-Protocol-Version": "2.0.0",
         },
         json=payload,
+        timeout=HTTP_TIMEOUT,
     )
     resp.raise_for_status()
     return resp.json()